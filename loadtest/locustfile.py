@@ -0,0 +1,115 @@
+"""
+Нагрузочный сценарий для представлений плагина Project Change Tracking.
+
+Воспроизводит типичный трафик UI: список проектов, формы добавления и
+редактирования, AJAX-запросы выбора connections/баз данных и таблица
+projects_to_load. Запускается против локального веб-сервера Airflow;
+stand-in connection, демо-проект и таблицу ct__tables создает
+seed_standins.py (он же печатает значения CT_* переменных):
+
+    python loadtest/seed_standins.py
+    CT_USERNAME=admin CT_PASSWORD=admin CT_PROJECT_DATABASE=airflow \\
+    locust -f loadtest/locustfile.py --host http://localhost:8080
+
+Запросы к target-базам (Exasol/MySQL) выполняются, только если задана
+CT_TARGET_CONNECTION.
+
+Часть запросов отправляется с заголовком X-CT-Profile (доля задается
+CT_PROFILE_RATIO, по умолчанию 0.1). Заголовок учитывается только при
+allow_profile_header = True в секции [project_change_tracking] airflow.cfg;
+собранные профили доступны пользователям с ролью Admin по
+/projectsview/api/profiles/.
+"""
+import logging
+import os
+import random
+import re
+
+from locust import HttpUser, task, between
+from locust.exception import StopUser
+
+
+BASE_URL = "/projectsview"
+USERNAME = os.environ.get("CT_USERNAME", "admin")
+PASSWORD = os.environ.get("CT_PASSWORD", "admin")
+PROJECT_DATABASE = os.environ.get("CT_PROJECT_DATABASE", "airflow")
+SOURCE_CONNECTION = os.environ.get("CT_SOURCE_CONNECTION", "ct_standin_source")
+SOURCE_DATABASE_TYPE = os.environ.get("CT_SOURCE_DATABASE_TYPE", "PostgreSQL")
+TARGET_CONNECTION = os.environ.get("CT_TARGET_CONNECTION", "")
+PROFILE_RATIO = float(os.environ.get("CT_PROFILE_RATIO", "0.1"))
+
+CSRF_TOKEN_PATTERN = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+class ProjectChangeTrackingUser(HttpUser):
+    """Пользователь, работающий со страницами плагина"""
+
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        """Авторизация через форму входа Airflow"""
+        response = self.client.get("/login/", name="login")
+        match = CSRF_TOKEN_PATTERN.search(response.text)
+        with self.client.post("/login/",
+                              data={"username": USERNAME,
+                                    "password": PASSWORD,
+                                    "csrf_token": match.group(1) if match else ""},
+                              name="login", catch_response=True) as response:
+            if response.status_code != 200 or "/login/" in response.url:
+                response.failure(f"login as {USERNAME} failed")
+                logging.error("Не удалось войти как %s, проверьте CT_USERNAME/CT_PASSWORD", USERNAME)
+                raise StopUser()
+
+        with self.client.get(f"{BASE_URL}/api/get_project_data/",
+                             params={"project_database": PROJECT_DATABASE},
+                             name="check_project", catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure(f"project {PROJECT_DATABASE} not found")
+                logging.error("Проект %s не найден, запустите loadtest/seed_standins.py", PROJECT_DATABASE)
+                raise StopUser()
+
+    def _headers(self) -> dict:
+        if random.random() < PROFILE_RATIO:
+            return {"X-CT-Profile": "1"}
+        return {}
+
+    @task(10)
+    def project_list(self):
+        self.client.get(f"{BASE_URL}/", headers=self._headers(), name="project_list")
+
+    @task(3)
+    def add_project_form(self):
+        """Открытие формы добавления и каскад AJAX-запросов выбора значений"""
+        self.client.get(f"{BASE_URL}/add", headers=self._headers(), name="project_add_data")
+        self.client.get(f"{BASE_URL}/api/get_connections/",
+                        params={"database_type": SOURCE_DATABASE_TYPE},
+                        headers=self._headers(), name="get_connections")
+        self.client.get(f"{BASE_URL}/api/get_source_database/",
+                        params={"connection": SOURCE_CONNECTION},
+                        headers=self._headers(), name="get_source_database")
+        if not TARGET_CONNECTION:
+            return
+        self.client.get(f"{BASE_URL}/api/get_connections/",
+                        params={"database_type": "Exasol"},
+                        headers=self._headers(), name="get_connections")
+        self.client.get(f"{BASE_URL}/api/get_target_database/",
+                        params={"connection": TARGET_CONNECTION},
+                        headers=self._headers(), name="get_target_database")
+
+    @task(5)
+    def edit_project(self):
+        self.client.get(f"{BASE_URL}/edit/{PROJECT_DATABASE}",
+                        headers=self._headers(), name="edit_project_data")
+        self.client.get(f"{BASE_URL}/api/get_project_data/",
+                        params={"project_database": PROJECT_DATABASE},
+                        headers=self._headers(), name="get_project_data")
+
+    @task(4)
+    def tables_to_load(self):
+        params = {"project_database": PROJECT_DATABASE,
+                  "connection": SOURCE_CONNECTION,
+                  "source_database_type": SOURCE_DATABASE_TYPE}
+        self.client.get(f"{BASE_URL}/projects_to_load", params=params,
+                        headers=self._headers(), name="projects_to_load")
+        self.client.get(f"{BASE_URL}/fetch_data", params=params,
+                        headers=self._headers(), name="fetch_data")
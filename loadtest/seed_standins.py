@@ -0,0 +1,133 @@
+"""
+Локальные stand-in данные для нагрузочного сценария locustfile.py.
+
+Вместо реальных MSSQL/Exasol источник проекта указывает на ту же
+PostgreSQL, где лежит airflow.atk_ct.ct_projects:
+
+* connection ct_standin_source (postgres) — копия airflow_postgres;
+* демо-проект в airflow.atk_ct.ct_projects с source_database_type
+  PostgreSQL и project_database, равным имени базы Airflow (запросы
+  fetch_data обращаются к {project_database}.dbo.ct__tables);
+* таблица dbo.ct__tables с тестовыми строками.
+
+Схему dbo скрипт помечает комментарием, если создал ее сам; --teardown
+удаляет схему только с этой пометкой.
+
+Target-connections (Exasol/MySQL) не создаются: запросы get_target_database
+в locustfile.py выполняются только при заданной CT_TARGET_CONNECTION.
+
+    python loadtest/seed_standins.py --tables 200
+    python loadtest/seed_standins.py --teardown
+"""
+import argparse
+
+from airflow import settings
+from airflow.models import Connection
+from airflow.providers.postgres.hooks.postgres import PostgresHook as PH
+
+
+STANDIN_CONNECTION_ID = "ct_standin_source"
+STANDIN_SCHEMA_COMMENT = "ct_standin"
+AIRFLOW_CONNECTION_ID = "airflow_postgres"
+
+
+def create_standin_connection() -> str:
+    """Создание connection ct_standin_source по образцу airflow_postgres; возвращает имя базы"""
+    session = settings.Session()
+    try:
+        base = session.query(Connection).filter(Connection.conn_id == AIRFLOW_CONNECTION_ID).one()
+        connection = session.query(Connection).filter(Connection.conn_id == STANDIN_CONNECTION_ID).one_or_none()
+        if connection is None:
+            connection = Connection(conn_id=STANDIN_CONNECTION_ID,
+                                    conn_type="postgres",
+                                    host=base.host,
+                                    schema=base.schema,
+                                    login=base.login,
+                                    password=base.password,
+                                    port=base.port)
+            session.add(connection)
+            session.commit()
+        return connection.schema
+    finally:
+        session.close()
+
+
+def seed(tables: int) -> None:
+    project_database = create_standin_connection()
+
+    with PH.get_hook(STANDIN_CONNECTION_ID).get_conn() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM information_schema.schemata WHERE schema_name = 'dbo';")
+            if cursor.fetchone() is None:
+                cursor.execute("CREATE SCHEMA dbo;")
+                cursor.execute(f"COMMENT ON SCHEMA dbo IS '{STANDIN_SCHEMA_COMMENT}';")
+            cursor.execute("""
+                           CREATE TABLE IF NOT EXISTS dbo.ct__tables (
+                               table_alias varchar(256) PRIMARY KEY,
+                               load integer NOT NULL DEFAULT 0,
+                               exists_in_source integer NOT NULL DEFAULT 1
+                           );""")
+            cursor.executemany(
+                """INSERT INTO dbo.ct__tables (table_alias, load, exists_in_source)
+                   VALUES (%s, %s, 1)
+                   ON CONFLICT (table_alias) DO NOTHING;""",
+                [(f"dbo.standin_table_{i:05d}", i % 2) for i in range(tables)]
+            )
+            cursor.execute(
+                """INSERT INTO airflow.atk_ct.ct_projects (
+                       source_database_type,
+                       source_connection_id,
+                       source_database,
+                       biview_database,
+                       project_database,
+                       biview_project_type,
+                       transfer_source_data,
+                       update_dags_schedule,
+                       transfer_dags_schedule
+                       )
+                   VALUES ('PostgreSQL', %s, %s, %s, %s, 1, false, '0 * * * *', '0 * * * *')
+                   ON CONFLICT (project_database) DO NOTHING;""",
+                (STANDIN_CONNECTION_ID, project_database, project_database, project_database)
+            )
+        conn.commit()
+
+    print(f"CT_PROJECT_DATABASE={project_database}")
+    print(f"CT_SOURCE_CONNECTION={STANDIN_CONNECTION_ID}")
+    print("CT_SOURCE_DATABASE_TYPE=PostgreSQL")
+
+
+def teardown() -> None:
+    session = settings.Session()
+    try:
+        connection = session.query(Connection).filter(Connection.conn_id == STANDIN_CONNECTION_ID).one_or_none()
+        if connection is None:
+            return
+
+        with PH.get_hook(STANDIN_CONNECTION_ID).get_conn() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM airflow.atk_ct.ct_projects WHERE source_connection_id = %s;",
+                               (STANDIN_CONNECTION_ID,))
+                cursor.execute("DROP TABLE IF EXISTS dbo.ct__tables;")
+                cursor.execute("SELECT obj_description(oid, 'pg_namespace') FROM pg_namespace WHERE nspname = 'dbo';")
+                schema = cursor.fetchone()
+                if schema is not None and schema[0] == STANDIN_SCHEMA_COMMENT:
+                    # Без CASCADE: схема удаляется, только если в ней ничего не осталось
+                    cursor.execute("DROP SCHEMA dbo;")
+            conn.commit()
+
+        session.delete(connection)
+        session.commit()
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=100, help="количество строк в dbo.ct__tables")
+    parser.add_argument("--teardown", action="store_true", help="удалить stand-in данные")
+    args = parser.parse_args()
+
+    if args.teardown:
+        teardown()
+    else:
+        seed(args.tables)
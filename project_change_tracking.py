@@ -16,6 +16,8 @@ from airflow.providers.microsoft.mssql.hooks.mssql import MsSqlHook as MSSH
 from airflow.providers.postgres.hooks.postgres import PostgresHook as PH
 from airflow.providers.exasol.hooks.exasol import ExasolHook as EH
 
+from request_profiling import profiled, profile_phase, profiles_admin_view, get_profile_store
+
 
 #  Инициализация фронт-части плагина
 bp = Blueprint(
@@ -272,6 +274,7 @@ class ProjectsView(AppBuilderBaseView):
     default_view = "project_list"
 
     @expose('/', methods=['GET'])
+    @profiled
     def project_list(self):
         """View list of projects"""
 
@@ -291,14 +294,18 @@ class ProjectsView(AppBuilderBaseView):
                         FROM airflow.atk_ct.ct_projects
                     """
 
-        columns = [field.label.text for field in ProjectForm()][:11]
+        with profile_phase("form_labels"):
+            columns = [field.label.text for field in ProjectForm()][:11]
         with get_connection_postgres().get_conn() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(sql_query)
+                with profile_phase("query"):
+                    cursor.execute(sql_query)
 
                 try:
-                    rows = cursor.fetchall()
-                    raw_projects = [dict(zip(columns, row)) for row in rows]
+                    with profile_phase("fetch"):
+                        rows = cursor.fetchall()
+                    with profile_phase("rows_to_dict"):
+                        raw_projects = [dict(zip(columns, row)) for row in rows]
 
                     projects = []
                     print(raw_projects)
@@ -323,20 +330,24 @@ class ProjectsView(AppBuilderBaseView):
                     print(projects)
                 except Exception as e:
                     flash(str(e), category="error")
-        return self.render_template("project_change_tracking.html",
-                                    projects=projects,
-                                    count_projects=len(raw_projects))
+        with profile_phase("render"):
+            return self.render_template("project_change_tracking.html",
+                                        projects=projects,
+                                        count_projects=len(raw_projects))
 
     @expose("/add", methods=['GET', 'POST'])
     @csrf.exempt
+    @profiled
     def project_add_data(self):
         """Add CT Project"""
 
-        form = ProjectForm()
+        with profile_phase("form"):
+            form = ProjectForm()
 
         if request.method == 'POST':
 
-            form_add = ProjectForm(request.form)
+            with profile_phase("form_parse"):
+                form_add = ProjectForm(request.form)
 
             sql_insert_query = f"""
                                 INSERT INTO airflow.atk_ct.ct_projects (
@@ -396,10 +407,12 @@ class ProjectsView(AppBuilderBaseView):
                 else:
                     flash(str(e), category='warning')
 
-        return self.render_template("add_projects.html", form=form)
+        with profile_phase("render"):
+            return self.render_template("add_projects.html", form=form)
 
     @expose("/edit/<string:project_database>", methods=['GET', 'POST'])
     @csrf.exempt
+    @profiled
     def edit_project_data(self, project_database):
         """Edit of project data"""
 
@@ -407,14 +420,19 @@ class ProjectsView(AppBuilderBaseView):
 
         with get_connection_postgres().get_conn() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(sql_select_query)
-                columns = [col[0] for col in cursor.description]
-                rows = cursor.fetchall()
-                projects_data = [dict(zip(columns, row)) for row in rows]
+                with profile_phase("query"):
+                    cursor.execute(sql_select_query)
+                with profile_phase("fetch"):
+                    columns = [col[0] for col in cursor.description]
+                    rows = cursor.fetchall()
+                with profile_phase("rows_to_dict"):
+                    projects_data = [dict(zip(columns, row)) for row in rows]
 
-        form_exist = ProjectForm(data=projects_data[0])
+        with profile_phase("form"):
+            form_exist = ProjectForm(data=projects_data[0])
 
-        form_update = ProjectForm(request.form)
+        with profile_phase("form_parse"):
+            form_update = ProjectForm(request.form)
 
         if request.method == 'POST':
 
@@ -458,9 +476,11 @@ class ProjectsView(AppBuilderBaseView):
                 else:
                     flash(str(e), category='warning')
 
-        return self.render_template("edit_project.html", form=form_exist)
+        with profile_phase("render"):
+            return self.render_template("edit_project.html", form=form_exist)
 
     @expose('/projects_to_load', methods=['GET'])
+    @profiled
     def projects_to_load(self):
         """Отображение списка таблиц"""
         project_database = request.args.get('project_database')
@@ -485,15 +505,19 @@ class ProjectsView(AppBuilderBaseView):
         return flask.redirect(url_for('ProjectsView.project_list'))
 
     @expose('/api/get_connections/', methods=['GET'])
+    @profiled
     def get_filtered_connections(self):
         """Функция возвращает список connections соответствующих принимаемому типу базы данных"""
         database_type = request.args.get('database_type')
         if not database_type:
             return jsonify({'status': 'error', 'message': 'No data provided'}), 400
-        connections = GetConnection.get_database_connection(database_type)
-        return jsonify(connections)
+        with profile_phase("query"):
+            connections = GetConnection.get_database_connection(database_type)
+        with profile_phase("jsonify"):
+            return jsonify(connections)
 
     @expose("/api/get_source_database/", methods=['GET'])
+    @profiled
     def get_source_database(self):
         """Функция возвращает список баз данных соответствующих принимаемым connections"""
 
@@ -514,6 +538,7 @@ class ProjectsView(AppBuilderBaseView):
         return jsonify(databases)
 
     @expose("/api/get_target_database/", methods=['GET'])
+    @profiled
     def get_target_database(self):
         """Функция возвращает список баз данных соответствующих принимаемым connections"""
 
@@ -533,6 +558,7 @@ class ProjectsView(AppBuilderBaseView):
         return jsonify(databases)
 
     @expose("/api/get_project_data/", methods=['GET'])
+    @profiled
     def get_project_data(self):
 
         project_database = request.args.get('project_database')
@@ -541,13 +567,17 @@ class ProjectsView(AppBuilderBaseView):
 
         with get_connection_postgres().get_conn() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(sql_select_query)
-                columns = [col[0] for col in cursor.description]
-                rows = cursor.fetchall()
+                with profile_phase("query"):
+                    cursor.execute(sql_select_query)
+                with profile_phase("fetch"):
+                    columns = [col[0] for col in cursor.description]
+                    rows = cursor.fetchall()
                 print(rows)
-                projects_data = [dict(zip(columns, row)) for row in rows][0]
+                with profile_phase("rows_to_dict"):
+                    projects_data = [dict(zip(columns, row)) for row in rows][0]
 
-        return jsonify(projects_data)
+        with profile_phase("jsonify"):
+            return jsonify(projects_data)
 
     @expose("/fetch_airflow_connections")
     @provide_session
@@ -560,6 +590,7 @@ class ProjectsView(AppBuilderBaseView):
             return jsonify({"status": "error", "message": str(e)})
 
     @expose("/fetch_data")
+    @profiled
     def fetch_data(self):
         project_database = request.args.get('project_database')
         connection_id = request.args.get('connection')
@@ -579,11 +610,14 @@ class ProjectsView(AppBuilderBaseView):
         print(sql_query)
         with get_hook_for_database(source_database_type, connection_id).get_conn() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(sql_query)
-                rows = cursor.fetchall()
+                with profile_phase("query"):
+                    cursor.execute(sql_query)
+                with profile_phase("fetch"):
+                    rows = cursor.fetchall()
+                    columns = [desc[0] for desc in cursor.description]
 
-                columns = [desc[0] for desc in cursor.description]
-                raw_projects = [dict(zip(columns, row)) for row in rows]
+                with profile_phase("rows_to_dict"):
+                    raw_projects = [dict(zip(columns, row)) for row in rows]
 
         response_data = {
             "status": "success",
@@ -591,10 +625,12 @@ class ProjectsView(AppBuilderBaseView):
             "results": raw_projects
         }
         print(response_data)
-        return jsonify(response_data)
+        with profile_phase("jsonify"):
+            return jsonify(response_data)
 
     @expose("/update_data_is_load", methods=['POST'])
     @csrf.exempt
+    @profiled
     def update_data_is_load(self):
         try:
             data = request.get_json()
@@ -649,6 +685,28 @@ class ProjectsView(AppBuilderBaseView):
             print(f"Error processing request: {e}")
             return jsonify({'status': 'error', 'message': str(e)}), 500
 
+    @expose("/api/profiles/", methods=['GET'])
+    @profiles_admin_view
+    def list_profiles(self):
+        """Последние профили запросов: время фаз без дерева вызовов"""
+        return jsonify({"status": "success", "profiles": get_profile_store().summaries()})
+
+    @expose("/api/profiles/<string:profile_id>", methods=['GET'])
+    @profiles_admin_view
+    def get_profile_report(self, profile_id):
+        """Текстовое дерево вызовов профиля"""
+        profile = get_profile_store().get(profile_id)
+        if profile is None:
+            return jsonify({'status': 'error', 'message': 'Profile not found'}), 404
+        return flask.Response(profile["report"], mimetype="text/plain")
+
+    @expose("/api/profiles/clear", methods=['POST'])
+    @profiles_admin_view
+    def clear_profiles(self):
+        """Очистить сохраненные профили"""
+        get_profile_store().clear()
+        return jsonify({'status': 'success'}), 200
+
 
 v_appbuilder_view = ProjectsView()
 v_appbuilder_package = {
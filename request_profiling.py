@@ -0,0 +1,271 @@
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from flask import g, request, make_response, jsonify, has_app_context
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+
+log = logging.getLogger(__name__)
+
+#  Настройки профилирования (секция [project_change_tracking] в airflow.cfg)
+CONFIG_SECTION = "project_change_tracking"
+PROFILE_HEADER = "X-CT-Profile"
+PROFILE_ID_HEADER = "X-CT-Profile-Id"
+ADMIN_ROLE = "Admin"
+DEFAULT_HISTORY_SIZE = 20
+
+#  cProfile на Python >= 3.12 занимает общий для процесса sys.monitoring,
+#  поэтому одновременно может работать только один профилировщик
+_cprofile_lock = threading.Lock()
+
+
+def _conf():
+    from airflow.configuration import conf
+    return conf
+
+
+def profile_all_requests() -> bool:
+    """Профилировать каждый запрос к представлениям плагина"""
+    return _conf().getboolean(CONFIG_SECTION, "profile_all_requests", fallback=False)
+
+
+def profile_header_allowed() -> bool:
+    """Разрешено ли включать профилирование заголовком запроса"""
+    return _conf().getboolean(CONFIG_SECTION, "allow_profile_header", fallback=False)
+
+
+def profiling_enabled() -> bool:
+    """Включен ли режим профилирования в каком-либо виде"""
+    return profile_all_requests() or profile_header_allowed()
+
+
+class ProfileStore:
+    """
+    Хранилище последних N профилей в каталоге на диске.
+
+    Каталог общий для всех воркеров gunicorn: каждый профиль пишется
+    отдельным JSON-файлом, после записи лишние старые файлы удаляются.
+    """
+
+    def __init__(self, directory: str, max_profiles: int):
+        if max_profiles < 1:
+            log.warning("profile_history_size = %s должен быть положительным, используется %s",
+                        max_profiles, DEFAULT_HISTORY_SIZE)
+            max_profiles = DEFAULT_HISTORY_SIZE
+        self.directory = directory
+        self.max_profiles = max_profiles
+        os.makedirs(directory, exist_ok=True)
+
+    def _files(self) -> List[str]:
+        """Файлы профилей от старых к новым"""
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(".json"))
+
+    def _read(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, name), encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            # Файл удален другим воркером или еще не дописан
+            return None
+
+    def _remove(self, name: str) -> None:
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def add(self, profile: Dict[str, Any]) -> str:
+        profile["pid"] = os.getpid()
+        profile["id"] = f"{profile['pid']}-{uuid.uuid4().hex[:12]}"
+        name = f"{time.time_ns():020d}_{profile['id']}.json"
+        tmp_path = os.path.join(self.directory, f".{name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(profile, file, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(self.directory, name))
+
+        files = self._files()
+        for old_name in files[:max(len(files) - self.max_profiles, 0)]:
+            self._remove(old_name)
+        return profile["id"]
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Профили без отчета профилировщика, от новых к старым"""
+        profiles = (self._read(name) for name in reversed(self._files()))
+        return [{key: value for key, value in profile.items() if key != "report"}
+                for profile in profiles if profile is not None]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        for name in self._files():
+            if name.endswith(f"_{profile_id}.json"):
+                return self._read(name)
+        return None
+
+    def clear(self) -> None:
+        for name in self._files():
+            self._remove(name)
+
+
+_profile_store = None
+_profile_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Хранилище профилей (каталог profile_dir, размер profile_history_size)"""
+    global _profile_store
+    with _profile_store_lock:
+        if _profile_store is None:
+            from airflow.configuration import AIRFLOW_HOME
+            directory = _conf().get(CONFIG_SECTION, "profile_dir",
+                                    fallback=os.path.join(AIRFLOW_HOME, "ct_profiles"))
+            max_profiles = _conf().getint(CONFIG_SECTION, "profile_history_size", fallback=DEFAULT_HISTORY_SIZE)
+            _profile_store = ProfileStore(directory, max_profiles)
+        return _profile_store
+
+
+def _profiling_requested() -> bool:
+    if profile_all_requests():
+        return True
+    return profile_header_allowed() and request.headers.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes")
+
+
+@contextmanager
+def profile_phase(name: str):
+    """Замер времени фазы обработки запроса (форма, выборка, сериализация, шаблон)"""
+    phases = g.get("ct_profile_phases") if has_app_context() else None
+    if phases is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases.append({"phase": name, "duration_ms": round((time.perf_counter() - started) * 1000, 3)})
+
+
+def _start_profiler():
+    """Запуск профилировщика; None, если профилировать запрос сейчас нельзя"""
+    if PyinstrumentProfiler is not None:
+        try:
+            profiler = PyinstrumentProfiler()
+            profiler.start()
+        except Exception:
+            log.warning("Не удалось запустить pyinstrument, запрос не профилируется", exc_info=True)
+            return None
+        return profiler
+
+    if not _cprofile_lock.acquire(blocking=False):
+        log.info("cProfile занят другим запросом, запрос не профилируется")
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        _cprofile_lock.release()
+        log.warning("Не удалось запустить cProfile, запрос не профилируется", exc_info=True)
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler) -> str:
+    """Останавливает профилировщик и возвращает текстовое дерево вызовов"""
+    if isinstance(profiler, cProfile.Profile):
+        try:
+            profiler.disable()
+        finally:
+            _cprofile_lock.release()
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(40)
+        stats.print_callees(20)
+        return stream.getvalue()
+    profiler.stop()
+    return profiler.output_text(unicode=True, show_all=False)
+
+
+def profiled(view_func):
+    """
+    Декоратор обработчика представления: при включенном профилировании
+    снимает дерево вызовов и время фаз запроса и сохраняет их в хранилище.
+
+    Должен стоять под @expose, чтобы маршрут указывал на обернутую функцию.
+    """
+
+    @functools.wraps(view_func)
+    def wrapper(*args, **kwargs):
+        if not _profiling_requested():
+            return view_func(*args, **kwargs)
+
+        profiler = _start_profiler()
+        if profiler is None:
+            return view_func(*args, **kwargs)
+
+        g.ct_profile_phases = []
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            response = make_response(view_func(*args, **kwargs))
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            phases = g.pop("ct_profile_phases", [])
+            try:
+                report = _stop_profiler(profiler)
+            except Exception as e:
+                log.warning("Не удалось сформировать отчет профилировщика", exc_info=True)
+                report = f"Profiler report is unavailable: {e}"
+
+        try:
+            profile_id = get_profile_store().add({
+                "endpoint": request.endpoint,
+                "method": request.method,
+                "path": request.full_path,
+                "status": response.status_code,
+                "started_at": started_at.isoformat(),
+                "duration_ms": duration_ms,
+                "phases": phases,
+                "profiler": "cProfile" if isinstance(profiler, cProfile.Profile) else "pyinstrument",
+                "report": report,
+            })
+        except Exception:
+            log.warning("Не удалось сохранить профиль запроса", exc_info=True)
+            return response
+        response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
+
+    return wrapper
+
+
+def _is_admin() -> bool:
+    user = g.get("user")
+    return any(role.name == ADMIN_ROLE for role in getattr(user, "roles", None) or [])
+
+
+def profiles_admin_view(view_func):
+    """
+    Декоратор представлений просмотра профилей: 404 при выключенном
+    профилировании, 403 для пользователей без роли Admin.
+    """
+
+    @functools.wraps(view_func)
+    def wrapper(*args, **kwargs):
+        if not profiling_enabled():
+            return jsonify({'status': 'error', 'message': 'Not found'}), 404
+        if not _is_admin():
+            return jsonify({'status': 'error', 'message': 'Access denied'}), 403
+        return view_func(*args, **kwargs)
+
+    return wrapper
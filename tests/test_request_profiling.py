@@ -0,0 +1,162 @@
+import os
+import sys
+
+import pytest
+from flask import Flask, g
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import request_profiling  # noqa: E402
+from request_profiling import ProfileStore, profile_phase, profiled, profiles_admin_view  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def test_store_evicts_oldest_profiles(tmp_path):
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    first = store.add({"endpoint": "a", "report": "ra"})
+    store.add({"endpoint": "b", "report": "rb"})
+    store.add({"endpoint": "c", "report": "rc"})
+
+    assert store.get(first) is None
+    assert [profile["endpoint"] for profile in store.summaries()] == ["c", "b"]
+
+
+def test_store_is_shared_between_instances(tmp_path):
+    profile_id = ProfileStore(str(tmp_path), max_profiles=5).add({"endpoint": "a", "report": "ra"})
+
+    other = ProfileStore(str(tmp_path), max_profiles=5)
+    assert profile_id.startswith(f"{os.getpid()}-")
+    assert other.get(profile_id)["report"] == "ra"
+
+
+def test_store_summaries_strip_report_and_keep_pid(tmp_path):
+    store = ProfileStore(str(tmp_path), max_profiles=5)
+    store.add({"endpoint": "a", "report": "ra"})
+
+    summary = store.summaries()[0]
+    assert "report" not in summary
+    assert summary["pid"] == os.getpid()
+    assert store.get(summary["id"])["report"] == "ra"
+
+
+def test_store_get_miss_and_clear(tmp_path):
+    store = ProfileStore(str(tmp_path), max_profiles=5)
+    profile_id = store.add({"endpoint": "a", "report": "ra"})
+
+    assert store.get("0-0") is None
+    store.clear()
+    assert store.get(profile_id) is None
+    assert store.summaries() == []
+
+
+def test_history_size_is_clamped(tmp_path):
+    store = ProfileStore(str(tmp_path), max_profiles=-1)
+
+    assert store.max_profiles == request_profiling.DEFAULT_HISTORY_SIZE
+
+
+def test_profile_phase_is_noop_outside_app_context():
+    with profile_phase("query"):
+        value = 1
+    assert value == 1
+
+
+def test_profile_phase_is_noop_outside_profiled_request(app):
+    with app.test_request_context("/"):
+        with profile_phase("query"):
+            pass
+        assert "ct_profile_phases" not in g
+
+
+def test_profiled_skips_profiling_when_profiler_busy(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(request_profiling, "profile_all_requests", lambda: True)
+    monkeypatch.setattr(request_profiling, "_start_profiler", lambda: None)
+    store = ProfileStore(str(tmp_path), max_profiles=5)
+    monkeypatch.setattr(request_profiling, "get_profile_store", lambda: store)
+
+    view = profiled(lambda: "ok")
+    with app.test_request_context("/"):
+        assert view() == "ok"
+    assert store.summaries() == []
+
+
+def test_profiled_records_phases(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(request_profiling, "profile_all_requests", lambda: True)
+    monkeypatch.setattr(request_profiling, "PyinstrumentProfiler", None)
+    store = ProfileStore(str(tmp_path), max_profiles=5)
+    monkeypatch.setattr(request_profiling, "get_profile_store", lambda: store)
+
+    def handler():
+        with profile_phase("query"):
+            pass
+        return "ok"
+
+    with app.test_request_context("/projects?x=1"):
+        response = profiled(handler)()
+
+    summary = store.summaries()[0]
+    assert response.status_code == 200
+    assert response.headers[request_profiling.PROFILE_ID_HEADER] == summary["id"]
+    assert [phase["phase"] for phase in summary["phases"]] == ["query"]
+    assert summary["profiler"] == "cProfile"
+
+
+def test_profiled_survives_store_failure(app, monkeypatch):
+    monkeypatch.setattr(request_profiling, "profile_all_requests", lambda: True)
+    monkeypatch.setattr(request_profiling, "PyinstrumentProfiler", None)
+
+    def broken_store():
+        raise ValueError("maxlen must be non-negative")
+
+    monkeypatch.setattr(request_profiling, "get_profile_store", broken_store)
+
+    with app.test_request_context("/"):
+        response = profiled(lambda: "ok")()
+    assert response.status_code == 200
+    assert request_profiling.PROFILE_ID_HEADER not in response.headers
+
+
+def test_admin_view_not_found_when_profiling_disabled(app, monkeypatch):
+    monkeypatch.setattr(request_profiling, "profiling_enabled", lambda: False)
+
+    with app.test_request_context("/"):
+        _, status = profiles_admin_view(lambda: "ok")()
+    assert status == 404
+
+
+def test_admin_view_requires_admin_role(app, monkeypatch):
+    monkeypatch.setattr(request_profiling, "profiling_enabled", lambda: True)
+
+    class Role:
+        def __init__(self, name):
+            self.name = name
+
+    class User:
+        roles = [Role("Viewer")]
+
+    view = profiles_admin_view(lambda: "ok")
+    with app.test_request_context("/"):
+        g.user = User()
+        _, status = view()
+        assert status == 403
+
+        User.roles = [Role("Admin")]
+        assert view() == "ok"
+
+
+def test_cprofile_is_not_started_twice(monkeypatch):
+    monkeypatch.setattr(request_profiling, "PyinstrumentProfiler", None)
+
+    profiler = request_profiling._start_profiler()
+    try:
+        assert profiler is not None
+        assert request_profiling._start_profiler() is None
+    finally:
+        request_profiling._stop_profiler(profiler)
+    second = request_profiling._start_profiler()
+    assert second is not None
+    request_profiling._stop_profiler(second)